@@ -0,0 +1,33 @@
+"""
+Configuration pytest commune aux tests SecureIoT-VIF
+"""
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Répartition xdist par groupe (xdist_group) pour les tests du simulateur
+
+    Avec -n, pytest-xdist répartit par défaut en mode "load" et ignore les
+    marqueurs xdist_group: chaque worker recompilerait et relancerait alors
+    le simulateur partagé build/simulator. Le mode "loadgroup" répartit les
+    tests non marqués exactement comme "load".
+    """
+    # Marqueur déclaré aussi sans pytest-xdist (exécution séquentielle)
+    config.addinivalue_line("markers", "xdist_group(name): tests exécutés sur un même worker xdist")
+
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        if getattr(config.option, "dist", None) == "load":
+            config.option.dist = "loadgroup"
+    elif workerinput.get("loadgroup"):
+        # Les workers analysent la ligne de commande d'origine, sans
+        # --dist loadgroup: activer le suffixe de groupe des identifiants
+        config.option.loadgroup = True
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Transmet le mode de répartition effectif aux workers xdist"""
+    node.workerinput["loadgroup"] = node.config.getvalue("dist") == "loadgroup"
@@ -3,13 +3,23 @@
 Tests automatisés de sécurité pour SecureIoT-VIF
 """
 
+import os
 import unittest
+import select
 import serial
 import time
 import re
 import json
 from pathlib import Path
 
+# Patterns regex précompilés pour read_serial_until_pattern
+ANOMALY_RE = re.compile(r"Anomalie|anomaly", re.MULTILINE)
+METRICS_RE = re.compile(r"Heartbeat système|ms\)", re.MULTILINE)
+
+# Fenêtre glissante du buffer série (caractères): seule la fin du log est
+# conservée, les messages vérifiés doivent donc tenir dans cette fenêtre
+SERIAL_WINDOW = 64 * 1024
+
 class SecureIoTVIFTests(unittest.TestCase):
     
     @classmethod
@@ -32,18 +42,55 @@ class SecureIoTVIFTests(unittest.TestCase):
         if hasattr(self, 'ser'):
             self.ser.close()
     
+    def wait_for_data(self, timeout):
+        """Attend l'arrivée de données série sans attente active"""
+        if os.name == "posix":
+            # POSIX: le noyau réveille le processus dès que des octets arrivent
+            select.select([self.ser], [], [], timeout)
+        else:
+            # Windows: select() n'accepte que des sockets, brève pause
+            # entre deux sondages
+            time.sleep(min(timeout, 0.01))
+    
     def read_serial_until_pattern(self, pattern, timeout=10):
-        """Lit le port série jusqu'à trouver un pattern"""
-        start_time = time.time()
+        """Lit le port série jusqu'à trouver un pattern
+
+        pattern est soit un texte littéral (recherché avec str.find), soit un
+        re.Pattern précompilé. Seules les nouvelles données sont analysées:
+        la recherche reprend juste avant la fin du texte déjà vu (littéral) ou
+        au début de la dernière ligne incomplète (regex), les patterns ne
+        devant pas s'étendre sur plusieurs lignes. Le buffer retourné est
+        limité aux SERIAL_WINDOW derniers caractères.
+        """
+        deadline = time.monotonic() + timeout
         buffer = ""
+        scan_pos = 0
+        literal = isinstance(pattern, str)
         
-        while time.time() - start_time < timeout:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            if not self.ser.in_waiting:
+                self.wait_for_data(remaining)
+            
             if self.ser.in_waiting:
                 data = self.ser.read(self.ser.in_waiting).decode('utf-8', errors='ignore')
                 buffer += data
+                if len(buffer) > SERIAL_WINDOW:
+                    trimmed = len(buffer) - SERIAL_WINDOW
+                    buffer = buffer[trimmed:]
+                    scan_pos = max(0, scan_pos - trimmed)
                 
-                if re.search(pattern, buffer, re.MULTILINE):
-                    return buffer
+                if literal:
+                    if buffer.find(pattern, scan_pos) != -1:
+                        return buffer
+                    scan_pos = max(0, len(buffer) - len(pattern) + 1)
+                else:
+                    if pattern.search(buffer, scan_pos):
+                        return buffer
+                    scan_pos = buffer.rfind("\n") + 1
         
         return buffer
     
@@ -57,7 +104,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         self.ser.setDTR(True)
         
         # Attendre les messages de démarrage
-        boot_log = self.read_serial_until_pattern(r"=== SecureIoT-VIF initialisé avec succès ===", timeout=30)
+        boot_log = self.read_serial_until_pattern("=== SecureIoT-VIF initialisé avec succès ===", timeout=30)
         
         # Vérifications
         self.assertIn("Démarrage SecureIoT-VIF", boot_log)
@@ -71,7 +118,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         """Test d'initialisation du crypto ESP32"""
         print("🧪 Test initialisation crypto ESP32...")
         
-        boot_log = self.read_serial_until_pattern(r"Auto-test réussi", timeout=20)
+        boot_log = self.read_serial_until_pattern("Auto-test réussi", timeout=20)
         
         # Vérifications crypto ESP32
         self.assertIn("Initialisation du gestionnaire crypto ESP32", boot_log)
@@ -86,7 +133,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         print("🧪 Test vérification d'intégrité...")
         
         # Attendre une vérification d'intégrité
-        integrity_log = self.read_serial_until_pattern(r"Vérification complète terminée", timeout=90)
+        integrity_log = self.read_serial_until_pattern("Vérification complète terminée", timeout=90)
         
         # Vérifications
         self.assertIn("Démarrage vérification complète du firmware", integrity_log)
@@ -106,7 +153,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         print("🧪 Test attestation continue...")
         
         # Attendre une attestation
-        attestation_log = self.read_serial_until_pattern(r"Attestation continue réussie", timeout=60)
+        attestation_log = self.read_serial_until_pattern("Attestation continue réussie", timeout=60)
         
         # Vérifications
         self.assertIn("Exécution attestation continue", attestation_log)
@@ -119,7 +166,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         print("🧪 Test lecture capteurs...")
         
         # Attendre une lecture de capteur
-        sensor_log = self.read_serial_until_pattern(r"Lecture capteur:", timeout=30)
+        sensor_log = self.read_serial_until_pattern("Lecture capteur:", timeout=30)
         
         # Vérifications
         self.assertIn("Lecture capteur:", sensor_log)
@@ -147,7 +194,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         print("🧪 Test détection d'anomalies...")
         
         # Lire les logs pendant 60 secondes pour détecter des anomalies
-        log_buffer = self.read_serial_until_pattern(r"Anomalie|anomaly", timeout=60)
+        log_buffer = self.read_serial_until_pattern(ANOMALY_RE, timeout=60)
         
         # Si aucune anomalie détectée, c'est normal en fonctionnement normal
         if "Anomalie" not in log_buffer:
@@ -164,7 +211,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         print("🧪 Test monitoring temps réel...")
         
         # Vérifier que le monitoring tourne
-        monitoring_log = self.read_serial_until_pattern(r"Vérification en temps réel", timeout=20)
+        monitoring_log = self.read_serial_until_pattern("Vérification en temps réel", timeout=20)
         
         if "Vérification en temps réel" in monitoring_log:
             self.assertIn("Démarrage vérification en temps réel", monitoring_log)
@@ -177,7 +224,7 @@ class SecureIoTVIFTests(unittest.TestCase):
         print("🧪 Test métriques de performance...")
         
         # Collecter les métriques pendant 30 secondes
-        metrics_log = self.read_serial_until_pattern(r"Heartbeat système|ms\)", timeout=30)
+        metrics_log = self.read_serial_until_pattern(METRICS_RE, timeout=30)
         
         # Analyser les temps de vérification
         timing_matches = re.findall(r"(\d+) ms\)", metrics_log)
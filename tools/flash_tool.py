@@ -8,92 +8,260 @@ Version optimisée pour ESP32 crypto intégré
 import os
 import sys
 import subprocess
+import shutil
 import argparse
 import json
+import glob
+import mmap
+import re
 from pathlib import Path
 import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-def run_command(cmd, check=True):
-    """Exécute une commande et affiche le résultat"""
-    print(f"🔧 Exécution: {cmd}")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr and result.returncode != 0:
-        print(f"❌ Erreur: {result.stderr}")
-    
-    if check and result.returncode != 0:
+# idf.py résolu une seule fois dans le PATH
+IDF_PY = shutil.which("idf.py") or "idf.py"
+
+# Blocs de texte statiques, écrits en une seule fois sur stdout
+BANNER = (
+    "🚀 ===============================================\n"
+    "🔐 SecureIoT-VIF v2.0 - ESP32 Crypto Intégré\n"
+    "💡 Solution crypto complète intégrée\n"
+    "⚡ Performance 4x améliorée avec crypto ESP32\n"
+    "🌍 Disponible partout dans le monde\n"
+    "🚀 ===============================================\n\n"
+)
+
+POST_FLASH_STEPS = (
+    "\n📋 Prochaines étapes:\n"
+    "  1️⃣  Lancer le monitoring: python tools/flash_tool.py monitor\n"
+    "  2️⃣  Vérifier les logs d'auto-test crypto ESP32\n"
+    "  3️⃣  Confirmer la lecture DHT22\n"
+    "  4️⃣  Valider l'attestation continue\n"
+    "\n💡 Setup ultra-simple avec seulement 3 connexions ESP32↔DHT22 !\n"
+)
+
+# __PORT__ est remplacé par le port série au moment de l'affichage
+MONITOR_TIPS = (
+    "📺 Monitoring SecureIoT-VIF v2.0 sur __PORT__...\n"
+    "🔍 Recherchez ces logs de succès v2.0:\n"
+    "  ✅ 'Démarrage SecureIoT-VIF ESP32 v2.0.0-ESP32-CRYPTO'\n"
+    "  ✅ 'Auto-test Crypto ESP32 RÉUSSI'\n"
+    "  ✅ 'Données capteur: T=XX.X°C, H=XX.X%'\n"
+    "  ✅ 'Vérification d'intégrité réussie'\n"
+    "  ✅ 'Attestation continue ESP32 réussie'\n"
+    "\n💡 Appuyez sur Ctrl+] pour quitter\n"
+)
+
+V2_ADVANTAGES = (
+    "\n🎉 Avantages v2.0:\n"
+    "  💰 68% moins cher (~8$ vs ~25$)\n"
+    "  ⚡ 4x plus rapide (crypto ESP32)\n"
+    "  🔧 Ultra simple (3 câbles vs 8+)\n"
+    "  🌍 Disponible partout (ESP32+DHT22)\n"
+    "  🆕 Solution crypto ESP32 intégrée complète !\n"
+    "\n🔐 Capacités ESP32 Intégrées:\n"
+    "  ✅ Hardware Security Module (HSM)\n"
+    "  ✅ True Random Number Generator (TRNG)\n"
+    "  ✅ AES/SHA/RSA Hardware Acceleration\n"
+    "  ✅ Secure Boot v2 & Flash Encryption\n"
+    "  ✅ eFuse pour stockage sécurisé\n"
+)
+
+@lru_cache(maxsize=64)
+def exists(path):
+    """os.path.exists mémorisé pour la durée du processus
+    
+    Le cache est vidé (exists.cache_clear()) après chaque écriture de
+    fichier par l'outil et après chaque commande idf.py.
+    """
+    return os.path.exists(path)
+
+def run_command(cmd, check=True, interactive=False, capture=False, quiet=False):
+    """Exécute une commande (liste d'arguments) sans shell intermédiaire
+
+    La sortie est relayée ligne par ligne vers le terminal pendant
+    l'exécution. Les commandes interactives (menuconfig, monitor) héritent
+    directement du terminal. Avec capture, la sortie (courte) n'est pas
+    affichée mais retournée dans l'attribut stdout du résultat. Avec quiet,
+    ni la commande ni sa sortie ne sont affichées (sauf en cas d'échec).
+    """
+    if not quiet:
+        print(f"🔧 Exécution: {' '.join(cmd)}")
+    stdout = None
+    try:
+        if interactive:
+            returncode = subprocess.run(cmd).returncode
+        elif capture or quiet:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    text=True, errors="replace")
+            returncode, stdout = result.returncode, result.stdout
+        else:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  bufsize=1, text=True, errors="replace") as proc:
+                for line in proc.stdout:
+                    sys.stdout.write(line)
+            returncode = proc.returncode
+    except FileNotFoundError:
+        print(f"❌ Erreur: commande introuvable: {cmd[0]}")
+        returncode = 127
+    
+    # La commande a pu créer ou supprimer des fichiers (build/, sdkconfig...)
+    exists.cache_clear()
+    
+    if returncode != 0:
+        if stdout:
+            # Sortie capturée: l'afficher pour diagnostiquer l'échec
+            sys.stdout.write(stdout)
+        print(f"❌ Erreur: code de retour {returncode}")
+    
+    if check and returncode != 0:
         sys.exit(1)
     
-    return result
+    return subprocess.CompletedProcess(cmd, returncode, stdout)
+
+# Marqueurs de version dans main/app_config.h
+V2_TAG = "2.0.0-ESP32-CRYPTO"
+V1_TAG = "1.0.0"
+VERSION_RE = re.compile(r"(2\.0\.0-ESP32-CRYPTO)|(1\.0\.0)")
+
+# Messages par version détectée (check_environment, show_version_info)
+VERSION_MESSAGES = {
+    V2_TAG: "✅ SecureIoT-VIF v2.0 détecté - ESP32 Crypto Intégré",
+    V1_TAG: ("⚠️  SecureIoT-VIF v1.0 détecté - Considérez la migration vers v2.0\n"
+             "💡 Voir docs/MIGRATION_GUIDE.md pour migrer vers ESP32 crypto"),
+    None: "❓ Version SecureIoT-VIF non identifiée"
+}
+
+VERSION_LABELS = {
+    V2_TAG: "v2.0.0 - ESP32 Crypto Intégré 🚀",
+    V1_TAG: "v1.0.0 - Version Ancienne",
+    None: "Non détectée"
+}
+
+@lru_cache(maxsize=1)
+def read_app_config():
+    """Contenu de main/app_config.h, lu une seule fois (None si absent)"""
+    path = "main/app_config.h"
+    return Path(path).read_text() if exists(path) else None
+
+@lru_cache(maxsize=1)
+def detect_version():
+    """Marqueur de version SecureIoT-VIF trouvé dans app_config.h, ou None"""
+    content = read_app_config() or ""
+    match = VERSION_RE.search(content)
+    if not match:
+        return None
+    if match.group(1):
+        return V2_TAG
+    # Le marqueur v2.0 reste prioritaire s'il apparaît plus loin
+    return V2_TAG if V2_TAG in content[match.end():] else V1_TAG
 
 def check_environment():
     """Vérifie l'environnement ESP-IDF et version v2.0"""
     print("🔍 Vérification environnement ESP-IDF v2.0...")
     
-    # Vérifier ESP-IDF
-    result = run_command("idf.py --version", check=False)
-    if result.returncode != 0:
-        print("❌ ESP-IDF non trouvé. Veuillez configurer votre environnement.")
-        print("💡 Exécutez: source $HOME/esp/esp-idf/export.sh")
-        sys.exit(1)
-    
-    print("✅ ESP-IDF configuré correctement")
+    # Vérifier ESP-IDF: lecture directe de $IDF_PATH, sans lancer idf.py
+    idf_path = os.environ.get("IDF_PATH")
+    if idf_path:
+        if not os.path.isdir(idf_path):
+            print(f"❌ ESP-IDF non trouvé dans IDF_PATH={idf_path}")
+            print("💡 Exécutez: source $HOME/esp/esp-idf/export.sh")
+            sys.exit(1)
+        
+        version_file = Path(idf_path) / "version.txt"
+        if version_file.exists():
+            print(f"✅ ESP-IDF {version_file.read_text().strip()} configuré correctement")
+        else:
+            print("✅ ESP-IDF configuré correctement")
+    else:
+        # IDF_PATH absent: seul idf.py --version permet de conclure
+        result = run_command([IDF_PY, "--version"], check=False, capture=True)
+        if result.returncode != 0:
+            print("❌ ESP-IDF non trouvé. Veuillez configurer votre environnement.")
+            print("💡 Exécutez: source $HOME/esp/esp-idf/export.sh")
+            sys.exit(1)
+        
+        idf_version = result.stdout.strip().splitlines()
+        if idf_version:
+            print(f"✅ {idf_version[-1]} configuré correctement")
+        else:
+            print("✅ ESP-IDF configuré correctement")
     
     # Vérifier version SecureIoT-VIF v2.0
-    if os.path.exists("main/app_config.h"):
-        with open("main/app_config.h", "r") as f:
-            content = f.read()
-            if "2.0.0-ESP32-CRYPTO" in content:
-                print("✅ SecureIoT-VIF v2.0 détecté - ESP32 Crypto Intégré")
-            elif "1.0.0" in content:
-                print("⚠️  SecureIoT-VIF v1.0 détecté - Considérez la migration vers v2.0")
-                print("💡 Voir docs/MIGRATION_GUIDE.md pour migrer vers ESP32 crypto")
-            else:
-                print("❓ Version SecureIoT-VIF non identifiée")
-    
+    if read_app_config() is not None:
+        print(VERSION_MESSAGES[detect_version()])
+    
+# Configuration automatique optimisée v2.0 (--auto-config)
+AUTO_CONFIG = (
+    # Configuration ESP32 Crypto Intégré
+    ("CONFIG_SECURE_IOT_ESP32_CRYPTO", "y"),
+    ("CONFIG_SECURE_IOT_SECURITY_LEVEL", "3"),
+    ("CONFIG_SECURE_IOT_ENABLE_SECURE_BOOT", "y"),
+    ("CONFIG_SECURE_IOT_ENABLE_FLASH_ENCRYPTION", "y"),
+    ("CONFIG_SECURE_IOT_ENABLE_EFUSE_PROTECTION", "y"),
+    
+    # Configuration capteurs (DHT22 seulement)
+    ("CONFIG_SECURE_IOT_DHT22_GPIO", "4"),
+    ("CONFIG_SECURE_IOT_DHT22_POWER_GPIO", "5"),
+    
+    # Intervalles optimisés v2.0
+    ("CONFIG_SECURE_IOT_INTEGRITY_CHECK_INTERVAL", "60"),
+    ("CONFIG_SECURE_IOT_ATTESTATION_INTERVAL", "30"),
+    
+    # Optimisations mbedTLS pour ESP32
+    ("CONFIG_MBEDTLS_HARDWARE_AES", "y"),
+    ("CONFIG_MBEDTLS_HARDWARE_SHA", "y"),
+    ("CONFIG_MBEDTLS_ECDSA_C", "y"),
+    ("CONFIG_MBEDTLS_ECP_C", "y"),
+    
+    # Configuration ESP32 performance
+    ("CONFIG_ESP32_DEFAULT_CPU_FREQ_240", "y"),
+    ("CONFIG_ESP32_ENABLE_COREDUMP", "n"),
+    ("CONFIG_ESP32_PANIC_HANDLER_REBOOT", "y")
+)
+
+# Contenu sdkconfig correspondant, construit une seule fois
+AUTO_CONFIG_PAYLOAD = "".join(f"{key}={value}\n" for key, value in AUTO_CONFIG).encode("ascii")
+
+# Lignes sdkconfig acceptées pour chaque option: après idf.py build, Kconfig
+# régénère le fichier complet et écrit les options à "n" sous la forme
+# "# KEY is not set"
+AUTO_CONFIG_LINES = tuple(
+    (f"{key}={value}".encode("ascii"),) + ((f"# {key} is not set".encode("ascii"),) if value == "n" else ())
+    for key, value in AUTO_CONFIG
+)
+AUTO_CONFIG_RE = re.compile(
+    rb"^(" + b"|".join(re.escape(line) for forms in AUTO_CONFIG_LINES for line in forms) + rb")\r?$",
+    re.MULTILINE
+)
+
+def auto_config_applied(sdkconfig):
+    """Indique si chaque option de AUTO_CONFIG figure déjà dans sdkconfig"""
+    try:
+        found = set(AUTO_CONFIG_RE.findall(sdkconfig.read_bytes()))
+    except FileNotFoundError:
+        return False
+    return all(any(line in found for line in forms) for forms in AUTO_CONFIG_LINES)
+
 def configure_project(args):
     """Configure le projet v2.0 avec optimisations ESP32 crypto"""
     print("⚙️ Configuration SecureIoT-VIF v2.0...")
     
     if args.auto_config:
-        # Configuration automatique optimisée v2.0
-        config = {
-            # Configuration ESP32 Crypto Intégré
-            "CONFIG_SECURE_IOT_ESP32_CRYPTO": "y",
-            "CONFIG_SECURE_IOT_SECURITY_LEVEL": "3",
-            "CONFIG_SECURE_IOT_ENABLE_SECURE_BOOT": "y", 
-            "CONFIG_SECURE_IOT_ENABLE_FLASH_ENCRYPTION": "y",
-            "CONFIG_SECURE_IOT_ENABLE_EFUSE_PROTECTION": "y",
-            
-            # Configuration capteurs (DHT22 seulement)
-            "CONFIG_SECURE_IOT_DHT22_GPIO": "4",
-            "CONFIG_SECURE_IOT_DHT22_POWER_GPIO": "5",
-            
-            # Intervalles optimisés v2.0
-            "CONFIG_SECURE_IOT_INTEGRITY_CHECK_INTERVAL": "60",
-            "CONFIG_SECURE_IOT_ATTESTATION_INTERVAL": "30",
-            
-            # Optimisations mbedTLS pour ESP32
-            "CONFIG_MBEDTLS_HARDWARE_AES": "y",
-            "CONFIG_MBEDTLS_HARDWARE_SHA": "y", 
-            "CONFIG_MBEDTLS_ECDSA_C": "y",
-            "CONFIG_MBEDTLS_ECP_C": "y",
-            
-            # Configuration ESP32 performance
-            "CONFIG_ESP32_DEFAULT_CPU_FREQ_240": "y",
-            "CONFIG_ESP32_ENABLE_COREDUMP": "n",
-            "CONFIG_ESP32_PANIC_HANDLER_REBOOT": "y"
-        }
-        
-        # Écrire la configuration optimisée v2.0
+        # Écrire la configuration optimisée v2.0 (une seule écriture)
         print("📝 Application configuration v2.0 optimisée...")
-        with open("sdkconfig", "w") as f:
-            for key, value in config.items():
-                f.write(f"{key}={value}\n")
         
-        print("✅ Configuration v2.0 ESP32 crypto appliquée")
+        # Options déjà présentes (y compris dans le sdkconfig complet
+        # régénéré par idf.py): ne pas réécrire le fichier pour que idf.py
+        # build ne régénère pas la configuration Kconfig (mtime préservé)
+        sdkconfig = Path("sdkconfig")
+        if auto_config_applied(sdkconfig):
+            print("✅ Configuration v2.0 ESP32 crypto déjà à jour")
+        else:
+            sdkconfig.write_bytes(AUTO_CONFIG_PAYLOAD)
+            exists.cache_clear()
+            print("✅ Configuration v2.0 ESP32 crypto appliquée")
         
         # Afficher les optimisations
         print("🚀 Optimisations v2.0 activées:")
@@ -106,32 +274,41 @@ def configure_project(args):
     else:
         # Configuration interactive
         print("🔧 Lancement configuration interactive...")
-        run_command("idf.py menuconfig")
+        run_command([IDF_PY, "menuconfig"], interactive=True)
+
+def binary_sizes(dirpath, names):
+    """Retourne {nom: taille} des fichiers de dirpath présents dans names
+    
+    Un seul parcours os.scandir: pas de exists() + getsize() par binaire.
+    """
+    try:
+        with os.scandir(dirpath) as entries:
+            return {e.name: e.stat().st_size for e in entries if e.name in names}
+    except FileNotFoundError:
+        return {}
 
 def build_project():
     """Compile le projet v2.0 avec optimisations"""
     print("🔨 Compilation SecureIoT-VIF v2.0...")
     
     start_time = time.time()
-    run_command("idf.py build")
+    run_command([IDF_PY, "build"])
     build_time = time.time() - start_time
     
     print(f"✅ Compilation terminée en {build_time:.1f}s")
     
     # Afficher les informations de build v2.0
-    if os.path.exists("build/bootloader/bootloader.bin"):
+    bootloader_sizes = binary_sizes("build/bootloader", {"bootloader.bin"})
+    if bootloader_sizes:
         print("📊 Taille des binaires:")
         
         # Taille bootloader
-        bootloader_size = os.path.getsize("build/bootloader/bootloader.bin")
-        print(f"  📦 Bootloader: {bootloader_size:,} bytes")
+        print(f"  📦 Bootloader: {bootloader_sizes['bootloader.bin']:,} bytes")
         
         # Taille application (estimation)
-        app_files = ["build/SecureIoT-VIF-ESP32.bin"]
-        for app_file in app_files:
-            if os.path.exists(app_file):
-                app_size = os.path.getsize(app_file)
-                print(f"  📦 Application: {app_size:,} bytes")
+        app_sizes = binary_sizes("build", {"SecureIoT-VIF-ESP32.bin"})
+        for app_size in app_sizes.values():
+            print(f"  📦 Application: {app_size:,} bytes")
                 
         print("💡 Optimisations v2.0:")
         print("  🚀 Plus compact sans librairies externes")
@@ -142,63 +319,149 @@ def flash_project(port):
     print(f"⚡ Flash SecureIoT-VIF v2.0 sur {port}...")
     
     start_time = time.time()
-    run_command(f"idf.py -p {port} flash")
+    run_command([IDF_PY, "-p", port, "flash"])
     flash_time = time.time() - start_time
     
     print(f"✅ Flash terminé en {flash_time:.1f}s")
     print("🎉 SecureIoT-VIF v2.0 avec ESP32 crypto déployé !")
     
     # Instructions post-flash v2.0
-    print("\n📋 Prochaines étapes:")
-    print("  1️⃣  Lancer le monitoring: python tools/flash_tool.py monitor")
-    print("  2️⃣  Vérifier les logs d'auto-test crypto ESP32")
-    print("  3️⃣  Confirmer la lecture DHT22")
-    print("  4️⃣  Valider l'attestation continue")
-    print("\n💡 Setup ultra-simple avec seulement 3 connexions ESP32↔DHT22 !")
+    sys.stdout.write(POST_FLASH_STEPS)
 
 def monitor_project(port):
     """Monitor les logs v2.0 avec affichage optimisé"""
-    print(f"📺 Monitoring SecureIoT-VIF v2.0 sur {port}...")
-    print("🔍 Recherchez ces logs de succès v2.0:")
-    print("  ✅ 'Démarrage SecureIoT-VIF ESP32 v2.0.0-ESP32-CRYPTO'")
-    print("  ✅ 'Auto-test Crypto ESP32 RÉUSSI'") 
-    print("  ✅ 'Données capteur: T=XX.X°C, H=XX.X%'")
-    print("  ✅ 'Vérification d'intégrité réussie'")
-    print("  ✅ 'Attestation continue ESP32 réussie'")
-    print("\n💡 Appuyez sur Ctrl+] pour quitter")
-    
-    run_command(f"idf.py -p {port} monitor")
-
-def detect_port():
-    """Détecte automatiquement le port série ESP32"""
+    sys.stdout.write(MONITOR_TIPS.replace("__PORT__", port))
+    
+    run_command([IDF_PY, "-p", port, "monitor"], interactive=True)
+
+# Convertisseurs USB-série utilisés par les cartes ESP32
+ESP32_PORT_RE = re.compile(r"cp210|ch340|ftdi|silicon labs|esp32", re.IGNORECASE)
+
+# Dernier port ESP32 détecté, réutilisé tant que le périphérique existe
+PORT_CACHE = Path("~/.cache/secureiot_vif/port.json").expanduser()
+
+def load_cached_port():
+    """Retourne le port ESP32 en cache s'il est toujours présent"""
+    try:
+        with open(PORT_CACHE, "r") as f:
+            device = json.load(f)["device"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return device if exists(device) else None
+
+def save_cached_port(port_info):
+    """Enregistre le port ESP32 détecté (VID:PID, numéro de série, device)"""
+    try:
+        PORT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(PORT_CACHE, "w") as f:
+            json.dump({
+                "vid": port_info.vid,
+                "pid": port_info.pid,
+                "serial_number": port_info.serial_number,
+                "device": port_info.device
+            }, f)
+    except OSError:
+        pass
+
+def scan_port(list_all=False):
+    """Recherche le port série ESP32 sans rien afficher ni écrire
+    
+    Sans list_all, le premier port ESP32 trouvé est retenu sans parcourir
+    les suivants (sous Linux, le premier /dev/ttyUSB* ou /dev/ttyACM*);
+    avec list_all (--auto-port), tous les candidats sont listés.
+    
+    Retourne (device, port_info, messages): port_info est le port à mettre
+    en cache (ou None), messages les lignes à afficher par l'appelant.
+    Utilisable depuis un thread: l'affichage et le cache restent au thread
+    principal (voir report_port).
+    """
+    # --auto-port liste les candidats: le port en cache est ignoré
+    if not list_all:
+        cached_port = load_cached_port()
+        if cached_port:
+            return cached_port, None, []
+    
+    # Linux: les adaptateurs USB-série apparaissent directement dans /dev,
+    # inutile de parcourir /sys via pyserial pour retenir le premier
+    if not list_all and sys.platform.startswith("linux"):
+        candidates = sorted(glob.glob("/dev/ttyUSB*")) + sorted(glob.glob("/dev/ttyACM*"))
+        if candidates:
+            return candidates[0], None, []
+    
     try:
         import serial.tools.list_ports
         
         ports = list(serial.tools.list_ports.comports())
         
         # Rechercher spécifiquement ESP32
-        esp32_ports = []
-        for p in ports:
-            desc_lower = p.description.lower()
-            if any(keyword in desc_lower for keyword in ['cp210', 'ch340', 'ftdi', 'silicon labs', 'esp32']):
-                esp32_ports.append(p.device)
+        esp32_ports = (p for p in ports if ESP32_PORT_RE.search(p.description or ""))
+        if list_all:
+            esp32_ports = list(esp32_ports)
+        selected_port = next(iter(esp32_ports), None)
         
-        if esp32_ports:
-            selected_port = esp32_ports[0]
-            if len(esp32_ports) > 1:
-                print(f"🔍 {len(esp32_ports)} ports ESP32 détectés:")
-                for i, port in enumerate(esp32_ports):
-                    print(f"  {i+1}. {port}")
-                print(f"📌 Sélection automatique: {selected_port}")
-            return selected_port
+        if selected_port:
+            messages = []
+            if list_all and len(esp32_ports) > 1:
+                messages.append(f"🔍 {len(esp32_ports)} ports ESP32 détectés:")
+                messages.extend(f"  {i+1}. {port.device}" for i, port in enumerate(esp32_ports))
+                messages.append(f"📌 Sélection automatique: {selected_port.device}")
+            return selected_port.device, selected_port, messages
         elif ports:
-            return ports[0].device
+            return ports[0].device, None, []
         else:
-            return "/dev/ttyUSB0"  # Défaut Linux
+            return "/dev/ttyUSB0", None, []  # Défaut Linux
             
     except ImportError:
-        print("⚠️  pyserial non installé, utilisation port par défaut")
-        return "/dev/ttyUSB0"
+        return "/dev/ttyUSB0", None, ["⚠️  pyserial non installé, utilisation port par défaut"]
+
+def report_port(device, port_info, messages):
+    """Affiche le résultat de scan_port, met le port en cache et le retourne"""
+    for message in messages:
+        print(message)
+    if port_info:
+        save_cached_port(port_info)
+    return device
+
+def detect_port(list_all=False):
+    """Détecte automatiquement le port série ESP32"""
+    return report_port(*scan_port(list_all))
+
+def wait_for_boot(port, timeout=3.0):
+    """Attend le premier octet émis par l'ESP32 (au plus timeout secondes)"""
+    deadline = time.monotonic() + timeout
+    try:
+        import serial
+        
+        with serial.Serial(port, 115200, timeout=timeout) as ser:
+            # read() rend la main dès le premier octet ou à l'échéance
+            if ser.read(1):
+                return
+    except (ImportError, OSError, ValueError):
+        pass
+    
+    # Port indisponible ou muet: conserver l'attente fixe d'origine
+    time.sleep(max(0.0, deadline - time.monotonic()))
+
+# Configurations et fichiers attendus par run_tests
+V2_REQUIRED_CONFIGS = (
+    "CONFIG_MBEDTLS_HARDWARE_AES=y",
+    "CONFIG_MBEDTLS_HARDWARE_SHA=y",
+    "CONFIG_MBEDTLS_ECDSA_C=y"
+)
+
+# Recherche directe dans sdkconfig projeté en mémoire (mmap, sans copie):
+# une passe qui ne retient que les lignes complètes KEY=valeur attendues
+V2_REQUIRED_CONFIGS_BYTES = tuple(c.encode("ascii") for c in V2_REQUIRED_CONFIGS)
+V2_REQUIRED_CONFIGS_RE = re.compile(
+    rb"^(" + b"|".join(re.escape(c) for c in V2_REQUIRED_CONFIGS_BYTES) + rb")\r?$",
+    re.MULTILINE
+)
+
+V2_FILES = (
+    "components/secure_element/esp32_crypto_manager.c",
+    "components/secure_element/include/esp32_crypto_manager.h",
+    "main/app_config.h"
+)
 
 def run_tests():
     """Exécute les tests v2.0 optimisés"""
@@ -207,27 +470,23 @@ def run_tests():
     # Tests de compilation v2.0
     print("📋 Test compilation v2.0...")
     start_time = time.time()
-    run_command("idf.py build")
+    run_command([IDF_PY, "build"])
     build_time = time.time() - start_time
     print(f"✅ Compilation réussie en {build_time:.1f}s")
     
     # Tests de configuration v2.0
     print("📋 Test configuration v2.0...")
-    if os.path.exists("sdkconfig"):
-        with open("sdkconfig", "r") as f:
-            config = f.read()
-            
-        # Vérifier les configurations v2.0 clés
-        v2_configs = [
-            "CONFIG_MBEDTLS_HARDWARE_AES=y",
-            "CONFIG_MBEDTLS_HARDWARE_SHA=y", 
-            "CONFIG_MBEDTLS_ECDSA_C=y"
-        ]
-        
-        missing_configs = []
-        for config_item in v2_configs:
-            if config_item not in config:
-                missing_configs.append(config_item)
+    if exists("sdkconfig"):
+        # Vérifier les configurations v2.0 clés (une ligne KEY=valeur chacune)
+        with open("sdkconfig", "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    found = set(V2_REQUIRED_CONFIGS_RE.findall(mm))
+            except ValueError:
+                # Fichier vide: mmap refuse une projection de taille nulle
+                found = set()
+        missing_configs = [c for c, needle in zip(V2_REQUIRED_CONFIGS, V2_REQUIRED_CONFIGS_BYTES)
+                           if needle not in found]
         
         if missing_configs:
             print("⚠️  Configurations v2.0 manquantes:")
@@ -240,16 +499,7 @@ def run_tests():
     
     # Test structure projet v2.0
     print("📋 Test structure projet v2.0...")
-    v2_files = [
-        "components/secure_element/esp32_crypto_manager.c",
-        "components/secure_element/include/esp32_crypto_manager.h", 
-        "main/app_config.h"
-    ]
-    
-    missing_files = []
-    for file_path in v2_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
+    missing_files = [p for p in V2_FILES if not exists(p)]
     
     if missing_files:
         print("❌ Fichiers v2.0 manquants:")
@@ -260,18 +510,23 @@ def run_tests():
     
     print("🎉 Tests v2.0 terminés")
 
+# Fichiers temporaires supprimés par clean_project
+TEMP_FILES = ("sdkconfig", "sdkconfig.old", "dependencies.lock")
+
 def clean_project():
     """Nettoie le projet v2.0"""
     print("🧹 Nettoyage SecureIoT-VIF v2.0...")
     
-    run_command("idf.py clean")
+    run_command([IDF_PY, "clean"])
     
     # Supprimer les fichiers temporaires v2.0
-    temp_files = ["sdkconfig", "sdkconfig.old", "dependencies.lock"]
-    for f in temp_files:
-        if os.path.exists(f):
-            os.remove(f)
+    for f in TEMP_FILES:
+        try:
+            Path(f).unlink()
             print(f"🗑️ Supprimé: {f}")
+        except FileNotFoundError:
+            pass
+    exists.cache_clear()
     
     print("✅ Nettoyage v2.0 terminé")
 
@@ -280,86 +535,80 @@ def show_version_info():
     print("📋 === Informations SecureIoT-VIF ===")
     
     # Détection version
-    version = "Non détectée"
-    if os.path.exists("main/app_config.h"):
-        with open("main/app_config.h", "r") as f:
-            content = f.read()
-            if "2.0.0-ESP32-CRYPTO" in content:
-                version = "v2.0.0 - ESP32 Crypto Intégré 🚀"
-            elif "1.0.0" in content:
-                version = "v1.0.0 - Version Ancienne"
-    
-    print(f"Version: {version}")
+    detected = detect_version()
+    print(f"Version: {VERSION_LABELS[detected]}")
     
     # Afficher les avantages v2.0 si détectée
-    if "2.0.0" in version:
-        print("\n🎉 Avantages v2.0:")
-        print("  💰 68% moins cher (~8$ vs ~25$)")
-        print("  ⚡ 4x plus rapide (crypto ESP32)")
-        print("  🔧 Ultra simple (3 câbles vs 8+)")
-        print("  🌍 Disponible partout (ESP32+DHT22)")
-        print("  🆕 Solution crypto ESP32 intégrée complète !")
-        
-        print("\n🔐 Capacités ESP32 Intégrées:")
-        print("  ✅ Hardware Security Module (HSM)")
-        print("  ✅ True Random Number Generator (TRNG)")
-        print("  ✅ AES/SHA/RSA Hardware Acceleration") 
-        print("  ✅ Secure Boot v2 & Flash Encryption")
-        print("  ✅ eFuse pour stockage sécurisé")
+    if detected == V2_TAG:
+        sys.stdout.write(V2_ADVANTAGES)
+
+# Actions utilisant le port série (options -p/--port et --auto-port)
+PORT_ACTIONS = ("flash", "monitor", "all")
+
+def run_all(args):
+    """Enchaîne configuration, flash et monitoring"""
+    configure_project(args)
+    flash_project(args.port)
+    print("\n⏳ Attente démarrage ESP32 avant monitoring...")
+    wait_for_boot(args.port)
+    monitor_project(args.port)
 
 def main():
     parser = argparse.ArgumentParser(description="Outil de développement SecureIoT-VIF v2.0 - ESP32 Crypto Intégré")
-    parser.add_argument("action", 
-                        choices=["build", "flash", "monitor", "all", "config", "test", "clean", "info"],
-                        help="Action à exécuter")
-    parser.add_argument("-p", "--port", help="Port série (auto-détection si non spécifié)")
-    parser.add_argument("--auto-config", action="store_true", 
-                        help="Configuration automatique v2.0 (optimisée ESP32 crypto)")
-    parser.add_argument("--auto-port", action="store_true",
-                        help="Détection automatique du port ESP32")
+    subparsers = parser.add_subparsers(dest="action", required=True, help="Action à exécuter")
+    
+    # Options partagées par les actions qui utilisent le port série
+    port_options = argparse.ArgumentParser(add_help=False)
+    port_options.add_argument("-p", "--port", help="Port série (auto-détection si non spécifié)")
+    port_options.add_argument("--auto-port", action="store_true",
+                              help="Détection automatique du port ESP32")
+    
+    config_options = argparse.ArgumentParser(add_help=False)
+    config_options.add_argument("--auto-config", action="store_true", 
+                                help="Configuration automatique v2.0 (optimisée ESP32 crypto)")
+    
+    subparsers.add_parser("build", help="Compiler le projet").set_defaults(
+        func=lambda args: build_project())
+    # idf.py flash recompile lui-même le projet (incrémental)
+    subparsers.add_parser("flash", parents=[port_options], help="Flasher le firmware").set_defaults(
+        func=lambda args: flash_project(args.port))
+    subparsers.add_parser("monitor", parents=[port_options], help="Monitorer les logs").set_defaults(
+        func=lambda args: monitor_project(args.port))
+    subparsers.add_parser("all", parents=[port_options, config_options],
+                          help="Configurer, flasher puis monitorer").set_defaults(func=run_all)
+    subparsers.add_parser("config", parents=[config_options], help="Configurer le projet").set_defaults(
+        func=configure_project)
+    subparsers.add_parser("test", help="Tests de compilation et de structure v2.0").set_defaults(
+        func=lambda args: run_tests())
+    subparsers.add_parser("clean", help="Nettoyer le projet").set_defaults(
+        func=lambda args: clean_project())
+    subparsers.add_parser("info", help="Informations de version").set_defaults(
+        func=lambda args: show_version_info())
     
     args = parser.parse_args()
     
     # Banner v2.0
-    print("🚀 ===============================================")
-    print("🔐 SecureIoT-VIF v2.0 - ESP32 Crypto Intégré")
-    print("💡 Solution crypto complète intégrée")
-    print("⚡ Performance 4x améliorée avec crypto ESP32")
-    print("🌍 Disponible partout dans le monde")
-    print("🚀 ===============================================\n")
-    
-    # Vérifier l'environnement
-    check_environment()
-    
-    # Détecter le port si demandé ou non spécifié
-    if args.auto_port or not args.port:
-        args.port = detect_port()
+    sys.stdout.write(BANNER)
+    
+    # Détecter le port (actions série seulement, si demandé ou non spécifié)
+    # en tâche de fond pendant la vérification de l'environnement; le
+    # résultat est affiché et mis en cache ici, une fois l'environnement validé
+    port_future = None
+    executor = ThreadPoolExecutor(max_workers=1)
+    if args.action in PORT_ACTIONS and (args.auto_port or not args.port):
+        port_future = executor.submit(scan_port, list_all=args.auto_port)
+    try:
+        check_environment()
+    finally:
+        executor.shutdown(wait=False)
+    
+    if port_future:
+        args.port = report_port(*port_future.result())
         print(f"🔍 Port ESP32 détecté: {args.port}")
     
     # Exécuter l'action demandée
     try:
-        if args.action == "info":
-            show_version_info()
-        elif args.action == "config":
-            configure_project(args)
-        elif args.action == "build":
-            build_project()
-        elif args.action == "flash":
-            build_project()
-            flash_project(args.port)
-        elif args.action == "monitor":
-            monitor_project(args.port)
-        elif args.action == "all":
-            configure_project(args)
-            build_project()
-            flash_project(args.port)
-            print("\n⏳ Attente 3s avant monitoring...")
-            time.sleep(3)
-            monitor_project(args.port)
-        elif args.action == "test":
-            run_tests()
-        elif args.action == "clean":
-            clean_project()
+        args.func(args)
         
     except KeyboardInterrupt:
         print("\n🛑 Opération interrompue par l'utilisateur")